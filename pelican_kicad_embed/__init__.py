@@ -10,10 +10,12 @@ The plugin automatically loads the KiCanvas JavaScript library when needed.
 
 from __future__ import annotations
 
+import functools
 import os
 import re
+from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
 from jinja2 import pass_context
 from pelican import signals
@@ -23,6 +25,7 @@ if TYPE_CHECKING:
     from pelican.contents import Content
 
 from .__about__ import __author__, __license__, __version__
+from ._html import build_embed
 
 __all__ = ["register", "kicad_schematic", "__version__", "__author__", "__license__"]
 
@@ -32,14 +35,76 @@ _pelican_settings = None
 # Flag to track if we've already injected the KiCanvas script
 _kicanvas_loaded = False
 
+# Per-syntax detection regexes, each paired with the literal sigil it starts with
+# (Markdown, reStructuredText, Liquid). A regex only runs when its sigil is
+# present, which str.__contains__ checks much more cheaply than the regex engine.
+# They are matched against case-folded text, so they don't need re.IGNORECASE.
+_KICAD_SYNTAX_SOURCES = (
+    ("{{", r"\{\{\s*kicad_schematic\s*\("),
+    ("..", r"\.\.\s+kicad-schematic::"),
+    ("{%", r"\{%\s*kicad_schematic\s+"),
+)
+_KICAD_SYNTAX_PATTERNS = tuple(
+    (sigil, re.compile(source)) for sigil, source in _KICAD_SYNTAX_SOURCES
+)
+
 # Regex pattern to detect any kicad_schematic usage in content
 KICAD_PATTERN = re.compile(
-    r"(\{\{\s*kicad_schematic\s*\(|"
-    r"\.\.\s+kicad-schematic::|"
-    r"\{%\s*kicad_schematic\s+)",
-    re.IGNORECASE | re.MULTILINE,
+    "(" + "|".join(source for _, source in _KICAD_SYNTAX_SOURCES) + ")",
+    re.IGNORECASE,
 )
 
+# Markdown metadata header lines ("Key: value", continued by indented lines)
+_HEADER_LINE_RE = re.compile(r"^[ ]{0,3}(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)$")
+_HEADER_CONTINUATION_RE = re.compile(r"^[ ]{4,}\S")
+
+# Defaults for kicad_schematic() when style/controls are empty
+_DEFAULT_STYLE = "width: 100%; height: 600px;"
+_DEFAULT_CONTROLS = "all"
+
+# The all-defaults element split around its src value, so that the common call
+# only has to splice in the path (derived from build_embed to stay in sync)
+_DEFAULT_EMBED_HEAD, _DEFAULT_EMBED_TAIL = build_embed(
+    "\0", _DEFAULT_CONTROLS, _DEFAULT_STYLE
+).split("\0")
+
+# KiCanvas script locations and the <script> tags injected for them
+_KICANVAS_URL_LOCAL = "/static/js/kicanvas.js"
+_KICANVAS_URL_CDN = "https://kicanvas.org/kicanvas/kicanvas.js"
+_SCRIPT_TAG_LOCAL = f'<script type="module" src="{_KICANVAS_URL_LOCAL}"></script>\n'
+_SCRIPT_TAG_CDN = f'<script type="module" src="{_KICANVAS_URL_CDN}"></script>\n'
+
+# Original reader ``read`` methods behind JinjaContentMixin, keyed by reader class
+_parent_read_cache: dict[type, Callable[..., tuple[str, dict]]] = {}
+
+
+def clear_caches(pelican_object: Any = None) -> None:
+    """Reset the per-build caches kept by the plugin.
+
+    Connected to ``signals.readers_init``, which every ``Pelican.run()`` sends
+    while creating its generators, before any content is read. Unlike
+    ``signals.initialized``, it is also sent on each rebuild of an
+    autoreload session, so files added or removed in between are seen.
+
+    Args:
+        pelican_object: Readers instance (unused, provided by the signal).
+    """
+    _resolve_schematic_path.cache_clear()
+    _resolved_path.cache_clear()
+    _path_exists.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _resolved_path(path: str) -> Path:
+    """Return ``Path(path).resolve()``, memoized for the current build."""
+    return Path(path).resolve()
+
+
+@functools.lru_cache(maxsize=None)
+def _path_exists(path: str) -> bool:
+    """Return ``Path(path).exists()``, memoized for the current build."""
+    return Path(path).exists()
+
 
 def resolve_schematic_path(
     filename: str,
@@ -65,14 +130,38 @@ def resolve_schematic_path(
     global _pelican_settings
 
     # If absolute URL, use as-is
-    if filename.startswith("/") or filename.startswith("http"):
+    if filename.startswith(("/", "http")):
         return filename
 
     # Get Pelican settings
     settings = _pelican_settings or {}
-    content_path = settings.get("PATH", "content")
-    output_path = settings.get("OUTPUT_PATH", "output")
 
+    return _resolve_schematic_path(
+        filename,
+        content_source_path,
+        article_url,
+        settings.get("PATH", "content"),
+        settings.get("OUTPUT_PATH", "output"),
+        settings.get("KICAD_SCHEMATICS_PATH"),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_schematic_path(
+    filename: str,
+    content_source_path: str | None,
+    article_url: str | None,
+    content_path: str,
+    output_path: str,
+    kicad_path: str | None,
+) -> str:
+    """Resolve a relative schematic filename, memoized for the current build.
+
+    See resolve_schematic_path() for the search order; the relevant settings
+    are passed explicitly so that they are part of the cache key. The result
+    also depends on which files exist, which the key cannot capture, so
+    clear_caches() drops it at the start of every run.
+    """
     # Strategy 1: Use article URL to construct output path (for articles)
     if article_url and content_source_path:
         # Remove trailing slash and convert to path
@@ -80,7 +169,7 @@ def resolve_schematic_path(
         # Build expected output location: output/{article_url}/{filename}
         expected_output = Path(output_path) / url_path / filename
 
-        if expected_output.exists():
+        if _path_exists(str(expected_output)):
             # Return as absolute URL from site root
             return f"/{url_path}/{filename}"
 
@@ -89,7 +178,7 @@ def resolve_schematic_path(
         source_dir = Path(content_source_path).parent
         schematic_source = source_dir / filename
 
-        if schematic_source.exists():
+        if _path_exists(str(schematic_source)):
             # File exists in source, will be copied to output
             # Use article URL as base
             return f"/{url_path}/{filename}"
@@ -99,11 +188,11 @@ def resolve_schematic_path(
         source_dir = Path(content_source_path).parent
         schematic_path = source_dir / filename
 
-        if schematic_path.exists():
+        if _path_exists(str(schematic_path)):
             # Calculate relative path from content root to schematic
             try:
-                content_root = Path(content_path).resolve()
-                rel_path = schematic_path.resolve().relative_to(content_root)
+                content_root = _resolved_path(str(content_path))
+                rel_path = _resolved_path(str(schematic_path)).relative_to(content_root)
                 # Return as absolute URL from site root
                 # Pelican copies files preserving directory structure
                 return "/" + str(rel_path).replace("\\", "/")
@@ -112,16 +201,40 @@ def resolve_schematic_path(
                 pass
 
     # Strategy 3: Try KICAD_SCHEMATICS_PATH if configured
-    kicad_path = settings.get("KICAD_SCHEMATICS_PATH")
     if kicad_path:
         schematic_path = Path(content_path) / kicad_path / filename
-        if schematic_path.exists():
+        if _path_exists(str(schematic_path)):
             return f"/{kicad_path}/{filename}"
 
     # Fallback: return as relative path (may not work in all contexts)
     return filename
 
 
+def _contains_kicad_syntax(text: str) -> bool:
+    """Return whether text uses any of the three kicad_schematic syntaxes.
+
+    Cheap substring checks run first, and each syntax regex is only run
+    when its leading sigil occurs in the text.
+
+    Args:
+        text: Raw content source.
+
+    Returns:
+        True if KICAD_PATTERN matches the text.
+    """
+    # Fold case once; the per-syntax regexes then match case-sensitively
+    folded = text.casefold()
+
+    # Every syntax variant names "kicad"
+    if "kicad" not in folded:
+        return False
+
+    return any(
+        sigil in folded and pattern.search(folded) is not None
+        for sigil, pattern in _KICAD_SYNTAX_PATTERNS
+    )
+
+
 def inject_kicanvas_script(content: Any) -> None:
     """Check if content uses kicad_schematic and inject KiCanvas script if needed.
 
@@ -133,12 +246,17 @@ def inject_kicanvas_script(content: Any) -> None:
     Args:
         content: Pelican content object (article or page).
     """
-    # Check if content has the _content attribute (raw source) and it's not None
-    if not hasattr(content, "_content") or content._content is None:
+    # Already marked by an earlier call: nothing left to detect
+    if getattr(content, "kicanvas_embed", False):
+        return
+
+    # Check if content has the _content attribute (raw source) and it's not empty
+    text = getattr(content, "_content", None)
+    if not text:
         return
 
     # Check if any kicad_schematic syntax is present
-    if KICAD_PATTERN.search(content._content):
+    if _contains_kicad_syntax(text):
         # Mark content as having kicanvas embed
         content.kicanvas_embed = True
 
@@ -152,19 +270,20 @@ def inject_kicanvas_script_into_html(content: Any) -> None:
     Args:
         content: Pelican content object with rendered HTML.
     """
-    if not getattr(content, "kicanvas_embed", False):
+    # Only inject once
+    if hasattr(content, "_kicanvas_script_injected"):
         return
 
-    if content.status != "published":
+    if not getattr(content, "kicanvas_embed", False):
         return
 
-    # Only inject once
-    if hasattr(content, "_kicanvas_script_injected"):
+    if content.status != "published":
         return
     content._kicanvas_script_injected = True
 
     # Check if content has rendered HTML
-    if not hasattr(content, "_content") or not content._content:
+    html = getattr(content, "_content", None)
+    if not html:
         return
 
     # Use local version by default, fallback to CDN if configured
@@ -172,27 +291,24 @@ def inject_kicanvas_script_into_html(content: Any) -> None:
     settings = _pelican_settings or {}
 
     use_cdn = settings.get("KICANVAS_USE_CDN", False)
-
-    if use_cdn:
-        kicanvas_url = "https://kicanvas.org/kicanvas/kicanvas.js"
-    else:
-        kicanvas_url = "/static/js/kicanvas.js"
-
-    # Create script tag
-    script_tag = f'<script type="module" src="{kicanvas_url}"></script>\n'
-
-    html = content._content
+    kicanvas_url = _KICANVAS_URL_CDN if use_cdn else _KICANVAS_URL_LOCAL
 
     # Check if script is already injected (avoid duplicates)
     if kicanvas_url in html:
         return
 
+    script_tag = _SCRIPT_TAG_CDN if use_cdn else _SCRIPT_TAG_LOCAL
+
     # Try to inject before </head>
-    if "</head>" in html:
-        content._content = html.replace("</head>", f"{script_tag}</head>", 1)
+    head_pos = html.find("</head>")
+    if head_pos >= 0:
+        content._content = html[:head_pos] + script_tag + html[head_pos:]
+        return
+
     # Otherwise inject at start of <body>
-    elif "<body" in html:
-        body_pos = html.find(">", html.find("<body")) + 1
+    body_pos = html.find("<body")
+    if body_pos >= 0:
+        body_pos = html.find(">", body_pos) + 1
         content._content = html[:body_pos] + "\n" + script_tag + html[body_pos:]
     # Last resort: prepend to content
     else:
@@ -247,6 +363,18 @@ def register_liquid_tag() -> None:
         pass
 
 
+@functools.lru_cache(maxsize=512)
+def _render_embed(src: str, controls: str, style: str) -> str:
+    """Build the kicad_schematic() element, substituting defaults for empty values.
+
+    The output depends only on the arguments, so it is memoized: pages
+    repeating the same embed reuse the already built string.
+    """
+    if not style and not controls:
+        return f"{_DEFAULT_EMBED_HEAD}{src}{_DEFAULT_EMBED_TAIL}"
+    return build_embed(src, controls or _DEFAULT_CONTROLS, style or _DEFAULT_STYLE)
+
+
 @pass_context
 def kicad_schematic(context: dict, filename: str, style: str = "", controls: str = "") -> str:
     """Generate KiCanvas embed HTML for use in Jinja2 templates.
@@ -272,12 +400,6 @@ def kicad_schematic(context: dict, filename: str, style: str = "", controls: str
     Example:
         {{ kicad_schematic('MOSFET.kicad_sch', style='width: 800px; height: 500px;') }}
     """
-    # Set defaults
-    if not style:
-        style = "width: 100%; height: 600px;"
-    if not controls:
-        controls = "all"
-
     # Try to get source path and article URL from Jinja2 context
     content_source_path = None
     article_url = None
@@ -310,7 +432,7 @@ def kicad_schematic(context: dict, filename: str, style: str = "", controls: str
     resolved_path = resolve_schematic_path(filename, content_source_path, article_url)
 
     # Generate HTML
-    return f'<kicanvas-embed src="{resolved_path}" controls="{controls}" style="{style}"></kicanvas-embed>'
+    return _render_embed(resolved_path, controls, style)
 
 
 def add_jinja2_globals(pelican_object: Any) -> None:
@@ -341,6 +463,77 @@ def add_jinja2_globals(pelican_object: Any) -> None:
         pelican_object.settings["JINJA_GLOBALS"]["kicad_schematic"] = kicad_schematic
 
 
+def _read_header_metadata(text: str) -> dict[str, str] | None:
+    """Extract the ``Key: value`` metadata header of a Markdown source.
+
+    This is a lightweight stand-in for a full reader pass, used to compute
+    the article URL before the content is rendered.
+
+    Args:
+        text: Raw source text.
+
+    Returns:
+        Mapping of lowercased keys to raw values, or None if the text does not
+        start with a Pelican Markdown metadata header.
+    """
+    metadata: dict[str, str] = {}
+    # Only the first few lines are needed: slice them out one at a time rather
+    # than splitting (or copying) the whole document
+    pos = 0
+    while pos < len(text):
+        end = text.find("\n", pos)
+        if end < 0:
+            end = len(text)
+        line = text[pos:end]
+        pos = end + 1
+        if not line.strip():
+            break
+        match = _HEADER_LINE_RE.match(line)
+        if match:
+            metadata[match.group("key").lower()] = match.group("value").strip()
+        elif not (metadata and _HEADER_CONTINUATION_RE.match(line)):
+            break
+    return metadata or None
+
+
+def _article_url_from_metadata(metadata: dict | None) -> str | None:
+    """Build an article's output URL from its date and slug metadata.
+
+    Args:
+        metadata: Metadata returned by the content reader.
+
+    Returns:
+        URL formatted with the ARTICLE_URL setting, or None if the metadata
+        lacks a date or slug or does not fit the pattern.
+    """
+    if not metadata:
+        return None
+
+    date = metadata.get("date")
+    slug = metadata.get("slug")
+    if not date or not slug:
+        return None
+
+    global _pelican_settings
+    settings = _pelican_settings or {}
+    article_url_pattern = settings.get("ARTICLE_URL", "blog/{slug}/")
+
+    try:
+        if isinstance(date, str):
+            date = datetime.fromisoformat(date)
+
+        return article_url_pattern.format(
+            slug=slug,
+            date=date,
+            year=date.year,
+            month=f"{date.month:02d}",
+            day=f"{date.day:02d}",
+        )
+    except (KeyError, IndexError, ValueError):
+        # Unparseable date or a pattern using unknown fields: no article URL
+        return None
+
+
 def patch_jinja2content_reader(readers: Any) -> None:
     """Monkey-patch pelican-jinja2content to inject source_path into render context.
 
@@ -356,53 +549,39 @@ def patch_jinja2content_reader(readers: Any) -> None:
         # jinja2content not installed, skip
         return
 
+    def parent_read(reader: Any) -> Callable[..., tuple[str, dict]]:
+        """Return the read method of the reader's non-Mixin base (MarkdownReader, RstReader, etc.)."""
+        reader_class = type(reader)
+        read = _parent_read_cache.get(reader_class)
+        if read is None:
+            for base in reader_class.__bases__:
+                if base is not JinjaContentMixin and hasattr(base, "read"):
+                    read = base.read
+                    break
+            else:
+                raise TypeError(f"{reader_class.__name__} has no reader base class to delegate to")
+            _parent_read_cache[reader_class] = read
+        return read
+
     def patched_read(self, source_path: str) -> tuple[str, dict]:
         """Patched read method that injects source_path and article URL into Jinja2 context."""
-        from tempfile import NamedTemporaryFile
+        from tempfile import mkstemp
 
+        from pelican.readers import MarkdownReader
         from pelican.utils import pelican_open
 
-        # First, read the file to extract metadata
-        for base in self.__class__.__bases__:
-            if base is not JinjaContentMixin and hasattr(base, "read"):
-                _, metadata = base.read(self, source_path)
-                break
+        read = parent_read(self)
 
-        # Calculate article URL from metadata
-        article_url = None
-        if metadata:
-            try:
-                from datetime import datetime
-
-                global _pelican_settings
-                settings = _pelican_settings or {}
-                article_url_pattern = settings.get("ARTICLE_URL", "blog/{slug}/")
-
-                # Get date and slug from metadata
-                date_str = metadata.get("date")
-                slug = metadata.get("slug")
-
-                if date_str and slug:
-                    # Parse date
-                    if isinstance(date_str, str):
-                        date = datetime.fromisoformat(date_str)
-                    else:
-                        date = date_str
-
-                    # Format URL
-                    article_url = article_url_pattern.format(
-                        slug=slug,
-                        date=date,
-                        year=date.year,
-                        month=f"{date.month:02d}",
-                        day=f"{date.day:02d}",
-                    )
-            except Exception:
-                # If anything fails, continue without article URL
-                pass
-
-        # Now render with context
         with pelican_open(source_path) as text:
+            # Calculate article URL from the metadata header, without a full parse
+            header = _read_header_metadata(text) if isinstance(self, MarkdownReader) else None
+            article_url = _article_url_from_metadata(header)
+            if article_url is None and (header is None or header.keys() >= {"date", "slug"}):
+                # Unknown header format or non-ISO date: let the original reader parse it
+                _, metadata = read(self, source_path)
+                article_url = _article_url_from_metadata(metadata)
+
+            # Now render with context
             # Inject source_path and article_url into the Jinja2 rendering context
             context = {
                 "__source_path__": source_path,
@@ -410,22 +589,31 @@ def patch_jinja2content_reader(readers: Any) -> None:
             }
             text = self.env.from_string(text).render(**context)
 
-        with NamedTemporaryFile(delete=False) as f:
-            f.write(text.encode())
-            f.close()
+        # Hand the rendered text to the original reader through a temporary file
+        fd, rendered_path = mkstemp()
+        try:
+            with open(fd, "wb") as f:
+                f.write(text.encode())
             # Call the original parent class's read method
-            # We need to get the proper parent (MarkdownReader, RstReader, etc.)
-            for base in self.__class__.__bases__:
-                if base is not JinjaContentMixin and hasattr(base, "read"):
-                    content, metadata = base.read(self, f.name)
-                    break
-            os.unlink(f.name)
-            return content, metadata
+            return read(self, rendered_path)
+        finally:
+            os.unlink(rendered_path)
 
     # Apply the patch
     JinjaContentMixin.read = patched_read
 
 
+def inject_scripts_before_write(generator: Any) -> None:
+    """Inject scripts into all articles and drafts before they're written.
+
+    Args:
+        generator: ArticlesGenerator instance.
+    """
+    inject = inject_kicanvas_script_into_html
+    for article in generator.articles + generator.drafts:
+        inject(article)
+
+
 def register() -> None:
     """Main plugin registration function.
 
@@ -433,6 +621,9 @@ def register() -> None:
     It registers all three syntax handlers (conditionally for Liquid Tag)
     and sets up the signal listener for automatic KiCanvas script injection.
     """
+    # Start every build (including autoreload rebuilds) with empty caches
+    signals.readers_init.connect(clear_caches)
+
     # Always register Markdown and reST (core dependencies)
     signals.initialized.connect(register_markdown_extension)
     register_rst_directive()
@@ -456,16 +647,7 @@ def register() -> None:
     signals.content_object_init.connect(inject_kicanvas_script)
 
     # Inject script into HTML after content is fully rendered (before writing)
-    from pelican import signals as pelican_signals
-
-    def inject_scripts_before_write(generator):
-        """Inject scripts into all articles before they're written."""
-        for article in generator.articles:
-            inject_kicanvas_script_into_html(article)
-        for draft in generator.drafts:
-            inject_kicanvas_script_into_html(draft)
-
-    pelican_signals.article_generator_finalized.connect(inject_scripts_before_write)
+    signals.article_generator_finalized.connect(inject_scripts_before_write)
 
     # Copy .kicad_sch files from source to article output directory
     signals.article_writer_finalized.connect(copy_kicad_schematics)
@@ -485,22 +667,56 @@ def copy_kicad_schematics(article_generator: Any, writer: Any) -> None:
     settings = article_generator.settings
     output_path = settings.get("OUTPUT_PATH", "output")
 
+    # Articles of a series often share a source directory: scan each one once.
+    # Plain os.path string operations keep this loop cheap on large sites.
+    schematics_by_dir: dict[str, list[str]] = {}
+
     for article in article_generator.articles + article_generator.drafts:
         if not hasattr(article, "source_path") or not hasattr(article, "save_as"):
             continue
 
         # Get source directory (where .md file is)
-        source_dir = Path(article.source_path).parent
-
-        # Get output directory (where index.html will be)
-        article_output_dir = Path(output_path) / Path(article.save_as).parent
+        source_dir = os.path.dirname(article.source_path)
 
         # Find all .kicad_sch files in source directory
-        for schematic in source_dir.glob("*.kicad_sch"):
-            dest = article_output_dir / schematic.name
+        schematics = schematics_by_dir.get(source_dir)
+        if schematics is None:
+            try:
+                names = os.listdir(source_dir or ".")
+            except OSError:
+                # Missing or unreadable directory: no matches, as with glob
+                names = []
+            # Same matches as glob("*.kicad_sch"): no dotfiles (e.g. macOS
+            # "._" AppleDouble files), case-insensitive on Windows
+            schematics = [
+                name
+                for name in names
+                if not name.startswith(".") and os.path.normcase(name).endswith(".kicad_sch")
+            ]
+            schematics_by_dir[source_dir] = schematics
+
+        if not schematics:
+            continue
 
-            # Create output directory if needed
-            dest.parent.mkdir(parents=True, exist_ok=True)
+        # Get output directory (where index.html will be), creating it if needed
+        article_output_dir = os.path.join(output_path, os.path.dirname(article.save_as))
+        os.makedirs(article_output_dir, exist_ok=True)
 
-            # Copy schematic file
-            shutil.copy2(schematic, dest)
+        for name in schematics:
+            schematic = os.path.join(source_dir, name)
+            dest = os.path.join(article_output_dir, name)
+
+            # Skip copies that are already up to date (incremental builds)
+            try:
+                src_stat, dest_stat = os.stat(schematic), os.stat(dest)
+            except FileNotFoundError:
+                pass
+            else:
+                if (
+                    src_stat.st_size == dest_stat.st_size
+                    and src_stat.st_mtime <= dest_stat.st_mtime
+                ):
+                    continue
+
+            # Copy schematic contents only; file metadata is irrelevant for web assets
+            shutil.copyfile(schematic, dest)
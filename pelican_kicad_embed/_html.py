@@ -0,0 +1,23 @@
+"""HTML generation shared by all kicad_schematic syntax handlers."""
+
+from __future__ import annotations
+
+__all__ = ["build_embed"]
+
+
+def build_embed(src: str, controls: str = "", style: str = "") -> str:
+    """Build a <kicanvas-embed> element.
+
+    Empty ``controls`` or ``style`` values are omitted from the output.
+
+    Args:
+        src: Value of the src attribute (schematic URL).
+        controls: Control buttons to show.
+        style: CSS style attributes.
+
+    Returns:
+        HTML string for the kicanvas-embed element.
+    """
+    controls_attr = f' controls="{controls}"' if controls else ""
+    style_attr = f' style="{style}"' if style else ""
+    return f'<kicanvas-embed src="{src}"{controls_attr}{style_attr}></kicanvas-embed>'
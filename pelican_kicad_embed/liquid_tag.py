@@ -14,6 +14,15 @@ from typing import Any
 
 from liquid_tags.mdx_liquid_tags import LiquidTags  # type: ignore[import-untyped]
 
+from ._html import build_embed
+
+# style="..." / controls='...' options. Only the option names are matched
+# case-insensitively (scoped inline flag); values are left alone. A
+# double-quoted value may contain single quotes; a single-quoted one may not
+# contain double quotes, which would end the double-quoted HTML attribute it
+# is copied into
+_OPT_RE = re.compile(r"""((?i:style|controls))\s*=\s*(?:"([^"]*)"|'([^'"]*)')""")
+
 
 @LiquidTags.register("kicad_schematic")  # type: ignore[misc]
 def kicad_schematic_tag(preprocessor: Any, tag: str, markup: str) -> str:
@@ -28,27 +37,25 @@ def kicad_schematic_tag(preprocessor: Any, tag: str, markup: str) -> str:
         HTML string for the kicanvas-embed element.
     """
     # Parse the markup: filename followed by style/controls in any order
-    # Extract filename first
-    filename_match = re.match(r"^\s*(\S+)", markup)
-    if not filename_match:
+    # Split off the filename first
+    parts = markup.split(None, 1)
+    if not parts:
         return f"<!-- Invalid kicad_schematic syntax: {markup} -->"
 
-    filename = filename_match.group(1)
-
-    # Extract style and controls (order-independent)
-    style_match = re.search(r'style\s*=\s*["\']([^"\']*)["\']', markup, re.IGNORECASE)
-    controls_match = re.search(r'controls\s*=\s*["\']([^"\']*)["\']', markup, re.IGNORECASE)
-
-    style = style_match.group(1) if style_match else ""
-    controls = controls_match.group(1) if controls_match else ""
-
-    # Build the HTML attributes
-    attrs = [f'src="/static/schematics/{filename}"']
+    filename = parts[0]
+    rest = parts[1] if len(parts) > 1 else ""
 
-    if controls:
-        attrs.append(f'controls="{controls}"')
+    # Extract style and controls (order-independent) in a single pass;
+    # the first occurrence of each option wins. Every option has an "=",
+    # so the common bare-filename tag skips the scan entirely.
+    options: dict[str, str] = {}
+    if "=" in rest:
+        for match in _OPT_RE.finditer(rest):
+            name, double_quoted, single_quoted = match.groups()
+            value = double_quoted if double_quoted is not None else single_quoted
+            options.setdefault(name.lower(), value)
 
-    if style:
-        attrs.append(f'style="{style}"')
+    style = options.get("style", "")
+    controls = options.get("controls", "")
 
-    return f"<kicanvas-embed {' '.join(attrs)}></kicanvas-embed>"
+    return build_embed(f"/static/schematics/{filename}", controls, style)
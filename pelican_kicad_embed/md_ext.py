@@ -12,34 +12,57 @@ from typing import Any, Sequence
 from markdown.extensions import Extension
 from markdown.preprocessors import Preprocessor
 
+from ._html import build_embed
+
 
 class KiCadSchematicPreprocessor(Preprocessor):
     """Preprocessor to convert {{ kicad_schematic(...) }} to HTML."""
 
     # Regex pattern to match {{ kicad_schematic(filename, style="...", controls="...") }}
+    # The pattern runs over the whole document, so whitespace and quoted values
+    # exclude "\n" (``[^\S\n]`` is ``\s`` minus newline) to keep matches on one line.
     PATTERN = re.compile(
-        r"\{\{\s*kicad_schematic\s*\(\s*"
-        r'(?:["\'](?P<quoted_filename>[^"\']+)["\']|(?P<unquoted_filename>\S+))\s*'  # Filename with or without quotes
-        r'(?:,\s*style\s*=\s*["\'](?P<style>[^"\']*)["\'])?'  # Allow empty style=""
-        r'(?:,\s*controls\s*=\s*["\'](?P<controls>[^"\']*)["\'])?'  # Allow empty controls=""
-        r"\s*\)\s*\}\}",
+        r"\{\{[^\S\n]*kicad_schematic[^\S\n]*\([^\S\n]*"
+        r'(?:["\'](?P<quoted_filename>[^"\'\n]+)["\']|(?P<unquoted_filename>\S+))[^\S\n]*'  # Filename with or without quotes
+        r'(?:,[^\S\n]*style[^\S\n]*=[^\S\n]*["\'](?P<style>[^"\'\n]*)["\'])?'  # Allow empty style=""
+        r'(?:,[^\S\n]*controls[^\S\n]*=[^\S\n]*["\'](?P<controls>[^"\'\n]*)["\'])?'  # Allow empty controls=""
+        r"[^\S\n]*\)[^\S\n]*\}\}",
         re.IGNORECASE,
     )
 
     def run(self, lines: Sequence[str]) -> list[str]:
         """Process lines to replace kicad_schematic syntax with HTML.
 
+        The lines are joined and substituted in a single regex pass rather
+        than one pass per line.
+
         Args:
             lines: Sequence of lines from the Markdown document.
 
         Returns:
             List of processed lines with kicad_schematic replaced by HTML.
         """
-        new_lines: list[str] = []
-        for line in lines:
-            new_line = self.PATTERN.sub(self._replace_match, line)
-            new_lines.append(new_line)
-        return new_lines
+        text = "\n".join(lines)
+        # Cheap literal check first: most documents contain no embed at all
+        if "{{" not in text:
+            return list(lines)
+        return self.run_text(text).split("\n")
+
+    def run_text(self, text: str) -> str:
+        """Replace kicad_schematic syntax with HTML in a whole document.
+
+        Same as :meth:`run`, for callers that already hold the document as
+        one string and don't need it split into lines.
+
+        Args:
+            text: Markdown source.
+
+        Returns:
+            Source with kicad_schematic replaced by HTML.
+        """
+        if "{{" not in text:
+            return text
+        return self.PATTERN.sub(self._replace_match, text)
 
     def _replace_match(self, match: Any) -> str:
         """Convert a regex match to the <kicanvas-embed> HTML element.
@@ -55,16 +78,7 @@ class KiCadSchematicPreprocessor(Preprocessor):
         style = match.group("style") or ""
         controls = match.group("controls") or ""
 
-        # Build the HTML attributes
-        attrs = [f'src="/static/schematics/{filename}"']
-
-        if controls:
-            attrs.append(f'controls="{controls}"')
-
-        if style:
-            attrs.append(f'style="{style}"')
-
-        return f"<kicanvas-embed {' '.join(attrs)}></kicanvas-embed>"
+        return build_embed(f"/static/schematics/{filename}", controls, style)
 
 
 class KiCadSchematicExtension(Extension):
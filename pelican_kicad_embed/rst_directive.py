@@ -4,9 +4,13 @@ This directive processes .. kicad-schematic:: syntax in reST files
 and converts it to <kicanvas-embed> HTML elements.
 """
 
+import functools
+
 from docutils import nodes
 from docutils.parsers.rst import Directive, directives
 
+from ._html import build_embed
+
 
 class KiCadSchematicDirective(Directive):
     """Directive to embed KiCad schematics using KiCanvas.
@@ -39,26 +43,19 @@ class KiCadSchematicDirective(Directive):
         style = self.options.get("style", "")
         controls = self.options.get("controls", "")
 
-        # Build the HTML attributes
-        attrs = [f'src="/static/schematics/{filename}"']
-
-        if controls:
-            attrs.append(f'controls="{controls}"')
-
-        if style:
-            attrs.append(f'style="{style}"')
-
         # Create the HTML element
-        html = f"<kicanvas-embed {' '.join(attrs)}></kicanvas-embed>"
+        html = build_embed(f"/static/schematics/{filename}", controls, style)
 
         # Return as a raw HTML node
         raw_node = nodes.raw("", html, format="html")
         return [raw_node]
 
 
+@functools.lru_cache(maxsize=None)
 def register_directive():
     """Register the directive with docutils.
 
-    This function should be called during plugin initialization.
+    This function should be called during plugin initialization. The docutils
+    directive registry is process-wide, so repeated calls are no-ops.
     """
     directives.register_directive("kicad-schematic", KiCadSchematicDirective)
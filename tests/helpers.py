@@ -0,0 +1,113 @@
+"""Shared helpers for the test suite."""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any
+
+from docutils import io
+from docutils.core import Publisher
+from docutils.parsers import rst
+from docutils.readers import standalone
+from docutils.writers import html5_polyglot
+
+# Settings the tests don't depend on, turned off to keep rendering cheap:
+# no docutils.conf lookup (which also keeps user config out of the tests), no
+# stylesheet embedding, no title promotion, and system messages are not
+# written to stderr (they still appear in the body, where tests can see them)
+_RST_SETTINGS: dict[str, Any] = {
+    "_disable_config": True,
+    "embed_stylesheet": False,
+    "doctitle_xform": False,
+    "warning_stream": False,
+}
+
+_publisher: Publisher | None = None
+
+
+def _get_publisher() -> Publisher:
+    """Return the shared docutils Publisher, building it on first use.
+
+    Setting up the reader, parser, writer and their settings is the costly
+    part of ``publish_parts``; doing it once lets every test reuse them.
+    """
+    global _publisher
+    if _publisher is None:
+        publisher = Publisher(
+            reader=standalone.Reader(),
+            parser=rst.Parser(),
+            writer=html5_polyglot.Writer(),
+            source_class=io.StringInput,
+            destination_class=io.StringOutput,
+        )
+        publisher.process_programmatic_settings(None, _RST_SETTINGS, None)
+        _publisher = publisher
+    return _publisher
+
+
+@functools.lru_cache(maxsize=128)
+def parse_rst(rst_text: str) -> str:
+    """Render reStructuredText and return the HTML body.
+
+    Equivalent to ``publish_parts(rst_text, writer_name="html5",
+    settings_overrides=_RST_SETTINGS)["body"]``.
+    Results are memoized per source string, since rendering is pure and
+    tests only read the returned HTML.
+
+    Args:
+        rst_text: reStructuredText source.
+
+    Returns:
+        HTML body fragment.
+
+    Raises:
+        ValueError: If docutils produced no body.
+    """
+    publisher = _get_publisher()
+    publisher.set_source(rst_text)
+    publisher.set_destination()
+    publisher.publish()
+    body = publisher.writer.parts.get("body", "")
+    if not body:
+        raise ValueError("RST parsing failed: no body returned")
+    return body
+
+
+@dataclass
+class FakePelican:
+    """Minimal stand-in for the Pelican (or Readers) object passed to signal handlers."""
+
+    env: Any = None
+    settings: dict[str, Any] = field(default_factory=dict)
+
+
+class _EmbedParser(HTMLParser):
+    """Collect the attributes of every <kicanvas-embed> start tag."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.embeds: list[dict[str, str | None]] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "kicanvas-embed":
+            self.embeds.append(dict(attrs))
+
+
+def embed_attrs(html: str) -> list[dict[str, str | None]]:
+    """Return the attributes of each <kicanvas-embed> element in html, in order.
+
+    Parsing once lets tests compare attribute values directly instead of
+    searching the markup for each expected ``name="value"`` fragment.
+
+    Args:
+        html: HTML fragment.
+
+    Returns:
+        One attribute dict per embed element.
+    """
+    parser = _EmbedParser()
+    parser.feed(html)
+    parser.close()
+    return parser.embeds
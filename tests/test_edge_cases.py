@@ -2,18 +2,20 @@
 
 import unittest
 
-from docutils.core import publish_parts
-
 from pelican_kicad_embed.md_ext import KiCadSchematicPreprocessor
 from pelican_kicad_embed.rst_directive import register_directive
+from tests.helpers import parse_rst
+
+register_directive()
 
 
 class TestMarkdownEdgeCases(unittest.TestCase):
     """Edge case tests for Markdown extension."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.preprocessor = KiCadSchematicPreprocessor(None)
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by all tests (the preprocessor is stateless)."""
+        cls.preprocessor = KiCadSchematicPreprocessor(None)
 
     def test_filename_without_extension(self):
         """Test handling of filename without .kicad_sch extension."""
@@ -114,63 +116,50 @@ class TestMarkdownEdgeCases(unittest.TestCase):
 class TestRstEdgeCases(unittest.TestCase):
     """Edge case tests for reStructuredText directive."""
 
-    @classmethod
-    def setUpClass(cls):
-        """Register the directive once."""
-        register_directive()
-
-    def _parse_rst(self, rst_text):
-        """Helper to parse reStructuredText."""
-        parts = publish_parts(rst_text, writer_name="html")
-        body = parts.get("body", "")
-        if not body:
-            raise ValueError("RST parsing failed: no body returned")
-        return body
-
     def test_filename_without_extension(self):
         """Test handling of filename without .kicad_sch extension."""
         rst = ".. kicad-schematic:: amplifier"
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn('src="/static/schematics/amplifier"', html)
 
     def test_filename_with_special_characters(self):
         """Test filename with special characters."""
         rst = ".. kicad-schematic:: my_amp-v2.0.kicad_sch"
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn('src="/static/schematics/my_amp-v2.0.kicad_sch"', html)
 
     def test_filename_with_unicode(self):
         """Test filename with Unicode characters."""
         rst = ".. kicad-schematic:: amplificateur_été.kicad_sch"
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn("été", html)
 
     def test_empty_style_option(self):
         """Test with empty style option."""
         rst = """.. kicad-schematic:: amp.kicad_sch
    :style:"""
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn('src="/static/schematics/amp.kicad_sch"', html)
 
     def test_empty_controls_option(self):
         """Test with empty controls option."""
         rst = """.. kicad-schematic:: amp.kicad_sch
    :controls:"""
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn('src="/static/schematics/amp.kicad_sch"', html)
 
     def test_style_with_semicolons(self):
         """Test style with multiple semicolon-separated properties."""
         rst = """.. kicad-schematic:: amp.kicad_sch
    :style: width: 800px; height: 600px; border: 1px solid #ccc;"""
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn("style=", html)
 
     def test_controls_with_invalid_value(self):
         """Test controls with non-standard value (should pass through)."""
         rst = """.. kicad-schematic:: amp.kicad_sch
    :controls: custom-value"""
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn('controls="custom-value"', html)
 
     def test_unknown_option_ignored(self):
@@ -180,7 +169,7 @@ class TestRstEdgeCases(unittest.TestCase):
    :style: width: 800px;"""
         # This should either work or raise docutils error
         try:
-            html = self._parse_rst(rst)
+            html = parse_rst(rst)
             # If it works, src should still be present
             self.assertIn('src="/static/schematics/amp.kicad_sch"', html)
         except Exception:
@@ -190,14 +179,14 @@ class TestRstEdgeCases(unittest.TestCase):
     def test_malformed_directive_name(self):
         """Test typo in directive name."""
         rst = ".. kicad-schemtic:: amp.kicad_sch"  # Missing 'a'
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         # Should not be processed as our directive
         self.assertNotIn("<kicanvas-embed", html)
 
     def test_filename_with_relative_path(self):
         """Test filename with relative path."""
         rst = ".. kicad-schematic:: ../parent/amp.kicad_sch"
-        html = self._parse_rst(rst)
+        html = parse_rst(rst)
         self.assertIn('src="/static/schematics/../parent/amp.kicad_sch"', html)
 
     def test_multiline_style(self):
@@ -207,7 +196,7 @@ class TestRstEdgeCases(unittest.TestCase):
            height: 600px;"""
         # This will likely fail or only capture first line - that's expected reST behavior
         try:
-            html = self._parse_rst(rst)
+            html = parse_rst(rst)
             self.assertIn('src="/static/schematics/amp.kicad_sch"', html)
         except Exception:
             # Expected - reST doesn't support multiline option values this way
@@ -220,17 +209,8 @@ class TestCrossFormatConsistency(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up test fixtures."""
-        register_directive()
         cls.md_preprocessor = KiCadSchematicPreprocessor(None)
 
-    def _parse_rst(self, rst_text):
-        """Helper to parse reStructuredText."""
-        parts = publish_parts(rst_text, writer_name="html")
-        body = parts.get("body", "")
-        if not body:
-            raise ValueError("RST parsing failed: no body returned")
-        return body
-
     def test_same_output_basic(self):
         """Test that basic usage produces similar HTML across formats."""
         # Markdown
@@ -239,7 +219,7 @@ class TestCrossFormatConsistency(unittest.TestCase):
 
         # reST
         rst = ".. kicad-schematic:: amp.kicad_sch"
-        rst_result = self._parse_rst(rst)
+        rst_result = parse_rst(rst)
 
         # Both should contain the same core HTML
         for result in [md_result, rst_result]:
@@ -256,7 +236,7 @@ class TestCrossFormatConsistency(unittest.TestCase):
         rst = """.. kicad-schematic:: amp.kicad_sch
    :style: width: 800px;
    :controls: full"""
-        rst_result = self._parse_rst(rst)
+        rst_result = parse_rst(rst)
 
         # Both should contain the same attributes
         for result in [md_result, rst_result]:
@@ -0,0 +1,35 @@
+"""Tests for the shared HTML builder."""
+
+import unittest
+
+from pelican_kicad_embed._html import build_embed
+
+
+class TestBuildEmbed(unittest.TestCase):
+    """Test cases for the build_embed function."""
+
+    def test_src_only(self):
+        """Test that empty controls and style are omitted."""
+        self.assertEqual(
+            build_embed("/static/schematics/amp.kicad_sch"),
+            '<kicanvas-embed src="/static/schematics/amp.kicad_sch"></kicanvas-embed>',
+        )
+
+    def test_all_attributes(self):
+        """Test attribute order: src, controls, style."""
+        self.assertEqual(
+            build_embed("amp.kicad_sch", controls="full", style="width: 800px;"),
+            '<kicanvas-embed src="amp.kicad_sch" controls="full" style="width: 800px;">'
+            "</kicanvas-embed>",
+        )
+
+    def test_style_without_controls(self):
+        """Test that style is emitted on its own when controls is empty."""
+        self.assertEqual(
+            build_embed("amp.kicad_sch", style="width: 800px;"),
+            '<kicanvas-embed src="amp.kicad_sch" style="width: 800px;"></kicanvas-embed>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,24 @@
 """Tests for the main plugin module (__init__.py)."""
 
+import os
+import shutil
+import tempfile
 import unittest
-from unittest.mock import Mock
-
-from pelican_kicad_embed import KICAD_PATTERN, inject_kicanvas_script
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pelican_kicad_embed
+from pelican_kicad_embed import (
+    KICAD_PATTERN,
+    _article_url_from_metadata,
+    _read_header_metadata,
+    clear_caches,
+    copy_kicad_schematics,
+    inject_kicanvas_script,
+    inject_kicanvas_script_into_html,
+    resolve_schematic_path,
+)
 
 
 class TestKicadPattern(unittest.TestCase):
@@ -66,10 +81,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_injects_script_when_markdown_syntax_found(self):
         """Test that script is injected when Markdown syntax is detected."""
-        content = Mock()
-        content._content = '{{ kicad_schematic("amp.kicad_sch") }}'
-        delattr(content, "kicanvas_embed")  # Ensure attribute doesn't exist initially
-        delattr(content, "extra_js")
+        content = SimpleNamespace(_content='{{ kicad_schematic("amp.kicad_sch") }}')
 
         inject_kicanvas_script(content)
 
@@ -79,10 +91,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_injects_script_when_rst_syntax_found(self):
         """Test that script is injected when reST syntax is detected."""
-        content = Mock()
-        content._content = ".. kicad-schematic:: amplifier.kicad_sch"
-        delattr(content, "kicanvas_embed")
-        delattr(content, "extra_js")
+        content = SimpleNamespace(_content=".. kicad-schematic:: amplifier.kicad_sch")
 
         inject_kicanvas_script(content)
 
@@ -92,10 +101,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_injects_script_when_liquid_syntax_found(self):
         """Test that script is injected when Liquid syntax is detected."""
-        content = Mock()
-        content._content = "{% kicad_schematic file.kicad_sch %}"
-        delattr(content, "kicanvas_embed")
-        delattr(content, "extra_js")
+        content = SimpleNamespace(_content="{% kicad_schematic file.kicad_sch %}")
 
         inject_kicanvas_script(content)
 
@@ -105,10 +111,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_does_not_inject_when_no_syntax_found(self):
         """Test that script is not injected when no kicad_schematic syntax found."""
-        content = Mock()
-        content._content = "Just normal text without any embeddings."
-        delattr(content, "kicanvas_embed")
-        delattr(content, "extra_js")
+        content = SimpleNamespace(_content="Just normal text without any embeddings.")
 
         inject_kicanvas_script(content)
 
@@ -118,7 +121,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_handles_missing_content_attribute(self):
         """Test that function handles content without _content attribute."""
-        content = Mock(spec=[])  # No _content attribute
+        content = SimpleNamespace()  # No _content attribute
 
         # Should not raise an exception
         inject_kicanvas_script(content)
@@ -129,13 +132,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_handles_none_content(self):
         """Test that function handles content with _content = None."""
-        content = Mock()
-        content._content = None
-        # Clean up any mock attributes
-        if hasattr(content, "kicanvas_embed"):
-            delattr(content, "kicanvas_embed")
-        if hasattr(content, "extra_js"):
-            delattr(content, "extra_js")
+        content = SimpleNamespace(_content=None)
 
         # Should not raise an exception
         inject_kicanvas_script(content)
@@ -143,17 +140,10 @@ class TestInjectKiCanvasScript(unittest.TestCase):
         # After calling with None content, these attributes should still not exist
         self.assertFalse(hasattr(content, "kicanvas_embed"))
         self.assertFalse(hasattr(content, "extra_js"))
-        content = Mock(spec=[])  # No _content attribute
-
-        # Should not raise exception
-        inject_kicanvas_script(content)
-
-        self.assertFalse(hasattr(content, "kicanvas_embed"))
 
     def test_preserves_existing_extra_js_list(self):
         """Test that existing extra_js list is preserved."""
-        content = Mock()
-        content._content = '{{ kicad_schematic("amp.kicad_sch") }}'
+        content = SimpleNamespace(_content='{{ kicad_schematic("amp.kicad_sch") }}')
         content.extra_js = ["https://example.com/other.js"]
 
         inject_kicanvas_script(content)
@@ -164,8 +154,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_converts_extra_js_string_to_list(self):
         """Test that extra_js string is converted to list."""
-        content = Mock()
-        content._content = '{{ kicad_schematic("amp.kicad_sch") }}'
+        content = SimpleNamespace(_content='{{ kicad_schematic("amp.kicad_sch") }}')
         content.extra_js = "https://example.com/other.js"
 
         inject_kicanvas_script(content)
@@ -175,8 +164,7 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_does_not_duplicate_script_url(self):
         """Test that script URL is not duplicated if already present."""
-        content = Mock()
-        content._content = '{{ kicad_schematic("amp.kicad_sch") }}'
+        content = SimpleNamespace(_content='{{ kicad_schematic("amp.kicad_sch") }}')
         kicanvas_url = "https://unpkg.com/kicanvas@latest/dist/kicanvas.js"
         content.extra_js = [kicanvas_url]
 
@@ -187,12 +175,11 @@ class TestInjectKiCanvasScript(unittest.TestCase):
 
     def test_handles_multiple_embeddings(self):
         """Test that script is injected once even with multiple embeddings."""
-        content = Mock()
-        content._content = """{{ kicad_schematic("a.kicad_sch") }}
+        content = SimpleNamespace(
+            _content="""{{ kicad_schematic("a.kicad_sch") }}
 {{ kicad_schematic("b.kicad_sch") }}
 .. kicad-schematic:: c.kicad_sch"""
-        delattr(content, "kicanvas_embed")
-        delattr(content, "extra_js")
+        )
 
         inject_kicanvas_script(content)
 
@@ -202,6 +189,324 @@ class TestInjectKiCanvasScript(unittest.TestCase):
         self.assertIsInstance(content.extra_js, list)
         self.assertEqual(content.extra_js.count(kicanvas_url), 1)
 
+    def test_detection_is_case_insensitive(self):
+        """Test that mixed-case syntax is detected, as with KICAD_PATTERN."""
+        content = SimpleNamespace(_content='{{ KiCad_Schematic("upper.kicad_sch") }}')
+
+        inject_kicanvas_script(content)
+
+        self.assertTrue(content.kicanvas_embed)
+
+    def test_already_marked_content_is_not_rescanned(self):
+        """Test that content already flagged as embedding skips the scan."""
+        content = SimpleNamespace(
+            _content='{{ kicad_schematic("marked.kicad_sch") }}', kicanvas_embed=True
+        )
+
+        with patch("pelican_kicad_embed._contains_kicad_syntax") as scan:
+            inject_kicanvas_script(content)
+
+        scan.assert_not_called()
+        self.assertTrue(content.kicanvas_embed)
+
+
+class TestInjectKiCanvasScriptIntoHtml(unittest.TestCase):
+    """Test cases for the inject_kicanvas_script_into_html function."""
+
+    script_tag = '<script type="module" src="/static/js/kicanvas.js"></script>\n'
+
+    def _make_content(self, html):
+        """Build a published content object flagged as using KiCanvas."""
+        content = Mock(spec=[])
+        content._content = html
+        content.kicanvas_embed = True
+        content.status = "published"
+        return content
+
+    def test_injects_before_head_end(self):
+        """Test that the script is inserted right before </head>."""
+        content = self._make_content("<html><head></head><body>x</body></html>")
+        inject_kicanvas_script_into_html(content)
+        self.assertEqual(
+            content._content,
+            f"<html><head>{self.script_tag}</head><body>x</body></html>",
+        )
+
+    def test_injects_after_body_start(self):
+        """Test that the script is inserted after <body> when there is no </head>."""
+        content = self._make_content('<body class="a"><p>x</p></body>')
+        inject_kicanvas_script_into_html(content)
+        self.assertEqual(
+            content._content,
+            f'<body class="a">\n{self.script_tag}<p>x</p></body>',
+        )
+
+    def test_prepends_to_fragment(self):
+        """Test that the script is prepended to HTML fragments."""
+        content = self._make_content("<p>x</p>")
+        inject_kicanvas_script_into_html(content)
+        self.assertEqual(content._content, f"{self.script_tag}<p>x</p>")
+
+    def test_does_not_inject_twice(self):
+        """Test that HTML already referencing the script is left unchanged."""
+        html = f"<head>{self.script_tag}</head>"
+        content = self._make_content(html)
+        inject_kicanvas_script_into_html(content)
+        self.assertEqual(content._content, html)
+
+
+class TestResolveSchematicPath(unittest.TestCase):
+    """Test cases for the resolve_schematic_path function."""
+
+    def setUp(self):
+        """Create a content tree with one article and its schematic."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.content_dir = self.test_dir / "content"
+        self.article_dir = self.content_dir / "blog" / "post"
+        self.article_dir.mkdir(parents=True)
+        self.source_path = str(self.article_dir / "index.md")
+        (self.article_dir / "amp.kicad_sch").write_text("(kicad_sch)")
+
+        settings = {
+            "PATH": str(self.content_dir),
+            "OUTPUT_PATH": str(self.test_dir / "output"),
+        }
+        patcher = patch.object(pelican_kicad_embed, "_pelican_settings", settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_caches()
+        self.addCleanup(clear_caches)
+
+    def tearDown(self):
+        """Remove the temporary content tree."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_absolute_url_unchanged(self):
+        """Test that absolute paths and URLs are returned as-is."""
+        self.assertEqual(resolve_schematic_path("/files/a.kicad_sch"), "/files/a.kicad_sch")
+        self.assertEqual(
+            resolve_schematic_path("https://example.com/a.kicad_sch"),
+            "https://example.com/a.kicad_sch",
+        )
+
+    def test_relative_to_article_url(self):
+        """Test that a schematic next to the source resolves under the article URL."""
+        result = resolve_schematic_path("amp.kicad_sch", self.source_path, "blog/2025/post/")
+        self.assertEqual(result, "/blog/2025/post/amp.kicad_sch")
+
+    def test_relative_to_content_root(self):
+        """Test that a schematic next to the source resolves from the content root."""
+        result = resolve_schematic_path("amp.kicad_sch", self.source_path)
+        self.assertEqual(result, "/blog/post/amp.kicad_sch")
+
+    def test_kicad_schematics_path_setting(self):
+        """Test lookup in KICAD_SCHEMATICS_PATH, which is part of the cache key."""
+        shared_dir = self.content_dir / "static" / "schematics"
+        shared_dir.mkdir(parents=True)
+        (shared_dir / "psu.kicad_sch").write_text("(kicad_sch)")
+
+        self.assertEqual(resolve_schematic_path("psu.kicad_sch"), "psu.kicad_sch")
+        pelican_kicad_embed._pelican_settings["KICAD_SCHEMATICS_PATH"] = "static/schematics"
+        self.assertEqual(
+            resolve_schematic_path("psu.kicad_sch"), "/static/schematics/psu.kicad_sch"
+        )
+
+    def test_missing_file_falls_back_to_filename(self):
+        """Test that unknown schematics are returned unchanged."""
+        result = resolve_schematic_path("missing.kicad_sch", self.source_path)
+        self.assertEqual(result, "missing.kicad_sch")
+
+    def test_file_removed_between_runs_loses_article_url(self):
+        """Test that a resolved URL is not reused once its schematic is gone."""
+        url = "blog/2025/post/"
+        self.assertEqual(
+            resolve_schematic_path("amp.kicad_sch", self.source_path, url),
+            "/blog/2025/post/amp.kicad_sch",
+        )
+        (self.article_dir / "amp.kicad_sch").unlink()
+
+        # Next run: readers_init reaches clear_caches before any content is read
+        clear_caches(SimpleNamespace(settings=pelican_kicad_embed._pelican_settings))
+        self.assertEqual(
+            resolve_schematic_path("amp.kicad_sch", self.source_path, url), "amp.kicad_sch"
+        )
+
+    def test_file_created_between_runs_is_resolved(self):
+        """Test that a schematic added after a lookup is found on the next run.
+
+        Autoreload calls Pelican.run() again without sending initialized, so the
+        caches must be reset by readers_init, which every run sends.
+        """
+        from pelican import signals
+
+        from pelican_kicad_embed import register
+
+        register()
+        self.assertIn(clear_caches, list(signals.readers_init.receivers_for(object())))
+
+        self.assertEqual(resolve_schematic_path("new.kicad_sch", self.source_path), "new.kicad_sch")
+        (self.article_dir / "new.kicad_sch").write_text("(kicad_sch)")
+
+        # Next run: readers_init reaches clear_caches before any content is read
+        clear_caches(SimpleNamespace(settings=pelican_kicad_embed._pelican_settings))
+        self.assertEqual(
+            resolve_schematic_path("new.kicad_sch", self.source_path), "/blog/post/new.kicad_sch"
+        )
+
+
+class TestArticleUrlFromMetadata(unittest.TestCase):
+    """Test cases for the _article_url_from_metadata helper."""
+
+    def setUp(self):
+        """Use a dated ARTICLE_URL pattern."""
+        settings = {"ARTICLE_URL": "blog/{year}/{month}/{slug}/"}
+        patcher = patch.object(pelican_kicad_embed, "_pelican_settings", settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_formats_url_from_string_date(self):
+        """Test that ISO date strings are parsed before formatting."""
+        metadata = {"date": "2025-11-17", "slug": "kicad-sample"}
+        self.assertEqual(_article_url_from_metadata(metadata), "blog/2025/11/kicad-sample/")
+
+    def test_missing_slug_or_date(self):
+        """Test that no URL is built without both date and slug."""
+        self.assertIsNone(_article_url_from_metadata({"date": "2025-11-17"}))
+        self.assertIsNone(_article_url_from_metadata({"slug": "kicad-sample"}))
+        self.assertIsNone(_article_url_from_metadata(None))
+
+    def test_invalid_date(self):
+        """Test that an unparseable date yields no URL instead of raising."""
+        metadata = {"date": "not a date", "slug": "kicad-sample"}
+        self.assertIsNone(_article_url_from_metadata(metadata))
+
+
+class TestReadHeaderMetadata(unittest.TestCase):
+    """Test cases for the _read_header_metadata helper."""
+
+    def test_reads_markdown_header(self):
+        """Test that Key: value lines up to the first blank line are parsed."""
+        text = "Title: Test\nDate: 2025-11-17\nTags: a,\n    b\nSlug: test\n\nNote: body"
+        self.assertEqual(
+            _read_header_metadata(text),
+            {"title": "Test", "date": "2025-11-17", "tags": "a,", "slug": "test"},
+        )
+
+    def test_reads_header_without_trailing_newline(self):
+        """Test that a source consisting only of a header is read to its end."""
+        self.assertEqual(
+            _read_header_metadata("Title: Test\nSlug: test"), {"title": "Test", "slug": "test"}
+        )
+
+    def test_returns_none_without_header(self):
+        """Test that sources without a metadata header are not guessed at."""
+        self.assertIsNone(_read_header_metadata("Test Article\n============\n"))
+        self.assertIsNone(_read_header_metadata("\nTitle: Test"))
+
+
+class TestCopyKiCadSchematics(unittest.TestCase):
+    """Test cases for the copy_kicad_schematics function."""
+
+    def setUp(self):
+        """Create a content tree and an empty output directory."""
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.content_dir = self.test_dir / "content"
+        self.output_dir = self.test_dir / "output"
+        self.content_dir.mkdir()
+
+    def tearDown(self):
+        """Remove the temporary tree."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _make_article(self, source_path, save_as):
+        """Build a minimal article object."""
+        article = Mock(spec=[])
+        article.source_path = str(source_path)
+        article.save_as = save_as
+        return article
+
+    def _run(self, articles):
+        """Run copy_kicad_schematics over the given articles."""
+        generator = Mock(spec=[])
+        generator.settings = {"OUTPUT_PATH": str(self.output_dir)}
+        generator.articles = articles
+        generator.drafts = []
+        copy_kicad_schematics(generator, None)
+
+    def test_copies_schematics_for_each_article(self):
+        """Test that schematics are copied next to every article sharing a directory."""
+        series_dir = self.content_dir / "series"
+        series_dir.mkdir()
+        (series_dir / "amp.kicad_sch").write_text("(kicad_sch amp)")
+        self._run(
+            [
+                self._make_article(series_dir / "part1.md", "blog/part1/index.html"),
+                self._make_article(series_dir / "part2.md", "blog/part2/index.html"),
+            ]
+        )
+
+        for part in ("part1", "part2"):
+            copied = self.output_dir / "blog" / part / "amp.kicad_sch"
+            self.assertEqual(copied.read_text(), "(kicad_sch amp)")
+
+    def test_skips_hidden_files(self):
+        """Test that dotfiles such as AppleDouble "._" files are not copied, as with glob."""
+        (self.content_dir / "amp.kicad_sch").write_text("(kicad_sch amp)")
+        (self.content_dir / "._amp.kicad_sch").write_bytes(b"\x00\x05\x16\x07")
+        self._run([self._make_article(self.content_dir / "post.md", "post/index.html")])
+
+        self.assertEqual(os.listdir(self.output_dir / "post"), ["amp.kicad_sch"])
+
+    def test_unreadable_directory_is_skipped(self):
+        """Test that a directory that cannot be listed does not abort the copy."""
+        locked_dir = self.content_dir / "locked"
+        locked_dir.mkdir()
+        (self.content_dir / "amp.kicad_sch").write_text("(kicad_sch amp)")
+        listdir = os.listdir
+
+        def fake_listdir(path):
+            if path == str(locked_dir):
+                raise PermissionError(path)
+            return listdir(path)
+
+        with patch("pelican_kicad_embed.os.listdir", side_effect=fake_listdir):
+            self._run(
+                [
+                    self._make_article(locked_dir / "post.md", "locked/index.html"),
+                    self._make_article(self.content_dir / "post.md", "post/index.html"),
+                ]
+            )
+
+        self.assertFalse((self.output_dir / "locked").exists())
+        self.assertTrue((self.output_dir / "post" / "amp.kicad_sch").exists())
+
+    def test_skips_up_to_date_copies(self):
+        """Test that an unchanged schematic is not copied again."""
+        source = self.content_dir / "amp.kicad_sch"
+        source.write_text("(kicad_sch v1)")
+        article = self._make_article(self.content_dir / "post.md", "post/index.html")
+        self._run([article])
+
+        copied = self.output_dir / "post" / "amp.kicad_sch"
+        # Same size and newer than the source: treated as up to date
+        copied.write_text("(kicad_sch v0)")
+        os.utime(source, (1_000_000, 1_000_000))
+        self._run([article])
+        self.assertEqual(copied.read_text(), "(kicad_sch v0)")
+
+        # Source modified after the copy: copied again
+        os.utime(source, None)
+        os.utime(copied, (1_000_000, 1_000_000))
+        self._run([article])
+        self.assertEqual(copied.read_text(), "(kicad_sch v1)")
+
+    def test_no_output_dir_without_schematics(self):
+        """Test that articles without schematics do not create output directories."""
+        (self.content_dir / "plain.md").write_text("Title: Plain")
+        self._run([self._make_article(self.content_dir / "plain.md", "plain/index.html")])
+
+        self.assertFalse((self.output_dir / "plain").exists())
+
 
 class TestPluginRegistration(unittest.TestCase):
     """Test cases for plugin registration functions."""
@@ -236,6 +541,44 @@ class TestPluginRegistration(unittest.TestCase):
 
         self.assertTrue(success)
 
+    def test_script_injection_handler_stays_connected(self):
+        """Test that register() keeps the before-write injection handler alive.
+
+        Pelican signals hold weak references, so the handler must not be a
+        closure local to register().
+        """
+        import gc
+
+        from pelican import signals
+
+        from pelican_kicad_embed import inject_scripts_before_write, register
+
+        register()
+        gc.collect()
+
+        receivers = list(signals.article_generator_finalized.receivers_for(object()))
+        self.assertIn(inject_scripts_before_write, receivers)
+
+    def test_inject_scripts_before_write_covers_drafts(self):
+        """Test that both published articles and drafts are processed."""
+        from pelican_kicad_embed import inject_scripts_before_write
+
+        article = Mock(spec=[])
+        article._content = "<p>article</p>"
+        article.kicanvas_embed = True
+        article.status = "published"
+        draft = Mock(spec=[])
+        draft.kicanvas_embed = False
+
+        generator = Mock(spec=[])
+        generator.articles = [article]
+        generator.drafts = [draft]
+        inject_scripts_before_write(generator)
+
+        self.assertIn("kicanvas.js", article._content)
+        self.assertTrue(article._kicanvas_script_injected)
+        self.assertFalse(hasattr(draft, "_kicanvas_script_injected"))
+
 
 if __name__ == "__main__":
     unittest.main()
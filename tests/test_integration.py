@@ -1,31 +1,23 @@
 """Integration tests with a minimal Pelican site."""
 
-import shutil
-import tempfile
 import unittest
-from pathlib import Path
-from unittest.mock import Mock
+from types import SimpleNamespace
 
+import pelican_kicad_embed
+from pelican_kicad_embed import KICAD_PATTERN, __version__, inject_kicanvas_script, register
+from pelican_kicad_embed.md_ext import KiCadSchematicPreprocessor
+from pelican_kicad_embed.rst_directive import register_directive
+from tests.helpers import parse_rst
 
-class TestPelicanIntegration(unittest.TestCase):
-    """Integration tests with full Pelican site generation."""
+register_directive()
 
-    def setUp(self):
-        """Set up a temporary Pelican test site."""
-        self.test_dir = tempfile.mkdtemp()
-        self.content_dir = Path(self.test_dir) / "content"
-        self.output_dir = Path(self.test_dir) / "output"
-        self.content_dir.mkdir()
-        self.output_dir.mkdir()
 
-    def tearDown(self):
-        """Clean up temporary test site."""
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+class TestPelicanIntegration(unittest.TestCase):
+    """Integration tests with full Pelican site generation."""
 
     def test_markdown_article_with_kicad_embed(self):
         """Test Markdown article with kicad_schematic gets processed."""
         # Create a test article
-        article_path = self.content_dir / "test_article.md"
         article_content = """Title: Test Article
 Date: 2025-11-17
 Category: Test
@@ -36,27 +28,18 @@ This is a test article with a KiCad schematic:
 
 More text after the schematic.
 """
-        article_path.write_text(article_content)
-
-        # Mock Pelican processing
-        from pelican_kicad_embed import inject_kicanvas_script
-        from pelican_kicad_embed.md_ext import KiCadSchematicPreprocessor
-
         # Test preprocessor
         preprocessor = KiCadSchematicPreprocessor(None)
-        lines = article_content.split("\n")
-        processed = preprocessor.run(lines)
+        processed_text = preprocessor.run_text(article_content)
 
         # Verify HTML was generated
-        processed_text = "\n".join(processed)
         self.assertIn("<kicanvas-embed", processed_text)
         self.assertIn('src="/static/schematics/amplifier.kicad_sch"', processed_text)
         self.assertIn('style="width: 800px;"', processed_text)
         self.assertIn('controls="full"', processed_text)
 
         # Test script injection
-        content_obj = Mock()
-        content_obj._content = article_content
+        content_obj = SimpleNamespace(_content=article_content)
         inject_kicanvas_script(content_obj)
 
         self.assertTrue(content_obj.kicanvas_embed)
@@ -64,7 +47,6 @@ More text after the schematic.
 
     def test_rst_article_with_kicad_embed(self):
         """Test reStructuredText article with kicad-schematic directive."""
-        article_path = self.content_dir / "test_article.rst"
         article_content = """Test Article
 ============
 
@@ -79,18 +61,8 @@ This is a test article with a KiCad schematic:
 
 More text after the schematic.
 """
-        article_path.write_text(article_content)
-
         # Test reST processing
-        from docutils.core import publish_parts
-
-        from pelican_kicad_embed.rst_directive import register_directive
-
-        register_directive()
-        parts = publish_parts(article_content, writer_name="html")
-        html = parts.get("body", "")
-        if not html:
-            self.fail("RST parsing failed: no body returned")
+        html = parse_rst(article_content)
 
         self.assertIn("<kicanvas-embed", html)
         self.assertIn('src="/static/schematics/amplifier.kicad_sch"', html)
@@ -98,10 +70,7 @@ More text after the schematic.
         self.assertIn("controls=", html)
 
         # Test script injection
-        from pelican_kicad_embed import inject_kicanvas_script
-
-        content_obj = Mock()
-        content_obj._content = article_content
+        content_obj = SimpleNamespace(_content=article_content)
         inject_kicanvas_script(content_obj)
 
         self.assertTrue(content_obj.kicanvas_embed)
@@ -116,12 +85,7 @@ This is a normal article without any KiCad schematics.
 Just regular text about electronics and circuits.
 """
 
-        from pelican_kicad_embed import inject_kicanvas_script
-
-        content_obj = Mock()
-        content_obj._content = article_content
-        delattr(content_obj, "kicanvas_embed")
-        delattr(content_obj, "extra_js")
+        content_obj = SimpleNamespace(_content=article_content)
 
         inject_kicanvas_script(content_obj)
 
@@ -148,13 +112,9 @@ Third schematic:
    :controls: minimal
 """
 
-        from pelican_kicad_embed.md_ext import KiCadSchematicPreprocessor
-
         # Test Markdown processing
         preprocessor = KiCadSchematicPreprocessor(None)
-        lines = article_content.split("\n")
-        processed = preprocessor.run(lines)
-        processed_text = "\n".join(processed)
+        processed_text = preprocessor.run_text(article_content)
 
         # All three should be present
         self.assertIn('src="/static/schematics/amp1.kicad_sch"', processed_text)
@@ -162,10 +122,7 @@ Third schematic:
         # amp3 won't be processed by Markdown preprocessor (it's reST)
 
         # Test script injection (should be added only once)
-        from pelican_kicad_embed import inject_kicanvas_script
-
-        content_obj = Mock()
-        content_obj._content = article_content
+        content_obj = SimpleNamespace(_content=article_content)
         inject_kicanvas_script(content_obj)
 
         self.assertTrue(content_obj.kicanvas_embed)
@@ -188,17 +145,12 @@ Liquid style:
 {% kicad_schematic amp3.kicad_sch %}
 """
 
-        from pelican_kicad_embed import KICAD_PATTERN
-
         # All three patterns should be detected
         matches = KICAD_PATTERN.findall(article_content)
         self.assertEqual(len(matches), 3)
 
         # Script should be injected
-        from pelican_kicad_embed import inject_kicanvas_script
-
-        content_obj = Mock()
-        content_obj._content = article_content
+        content_obj = SimpleNamespace(_content=article_content)
         inject_kicanvas_script(content_obj)
 
         self.assertTrue(content_obj.kicanvas_embed)
@@ -207,11 +159,8 @@ Liquid style:
         """Test that script injection preserves existing extra_js."""
         article_content = '{{ kicad_schematic("amp.kicad_sch") }}'
 
-        from pelican_kicad_embed import inject_kicanvas_script
-
         # Test with list
-        content_obj = Mock()
-        content_obj._content = article_content
+        content_obj = SimpleNamespace(_content=article_content)
         content_obj.extra_js = ["https://example.com/script1.js", "https://example.com/script2.js"]
         inject_kicanvas_script(content_obj)
 
@@ -224,10 +173,7 @@ Liquid style:
         """Test that calling inject_kicanvas_script multiple times doesn't duplicate script."""
         article_content = '{{ kicad_schematic("amp.kicad_sch") }}'
 
-        from pelican_kicad_embed import inject_kicanvas_script
-
-        content_obj = Mock()
-        content_obj._content = article_content
+        content_obj = SimpleNamespace(_content=article_content)
 
         # Call multiple times
         inject_kicanvas_script(content_obj)
@@ -244,21 +190,15 @@ class TestPluginRegistration(unittest.TestCase):
 
     def test_register_function_exists(self):
         """Test that register() function exists and is callable."""
-        from pelican_kicad_embed import register
-
         self.assertTrue(callable(register))
 
     def test_all_exports(self):
         """Test that __all__ exports are defined."""
-        from pelican_kicad_embed import __all__
-
-        self.assertIn("register", __all__)
-        self.assertIn("__version__", __all__)
+        self.assertIn("register", pelican_kicad_embed.__all__)
+        self.assertIn("__version__", pelican_kicad_embed.__all__)
 
     def test_version_defined(self):
         """Test that version is defined."""
-        from pelican_kicad_embed import __version__
-
         self.assertIsInstance(__version__, str)
         self.assertRegex(__version__, r"\d+\.\d+\.\d+")
 
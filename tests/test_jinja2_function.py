@@ -3,6 +3,7 @@
 import unittest
 
 from pelican_kicad_embed import kicad_schematic
+from pelican_kicad_embed._html import build_embed
 
 
 class TestJinja2Function(unittest.TestCase):
@@ -56,6 +57,12 @@ class TestJinja2Function(unittest.TestCase):
         self.assertTrue(result.startswith("<kicanvas-embed"))
         self.assertTrue(result.endswith("</kicanvas-embed>"))
 
+    def test_defaults_match_explicit_values(self):
+        """Test that the all-defaults output equals the explicitly built element."""
+        expected = build_embed("test.kicad_sch", "all", "width: 100%; height: 600px;")
+        self.assertEqual(kicad_schematic({}, "test.kicad_sch"), expected)
+        self.assertEqual(kicad_schematic({}, "test.kicad_sch", controls="all"), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
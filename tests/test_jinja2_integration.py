@@ -5,24 +5,27 @@ specifically for compatibility with pelican-jinja2content plugin.
 """
 
 import unittest
-from unittest.mock import Mock
+from types import SimpleNamespace
 
 from jinja2 import Environment
 
+from pelican_kicad_embed import kicad_schematic
+from tests.helpers import FakePelican
+
 
 class TestJinja2Integration(unittest.TestCase):
     """Test Jinja2 template integration."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Import the function
-        from pelican_kicad_embed import kicad_schematic
-
-        # Create a Jinja2 environment
-        self.env = Environment()
+    @classmethod
+    def setUpClass(cls):
+        """Set up one Jinja2 environment shared by all tests (none of them mutate it)."""
+        cls.env = Environment()
 
         # Register the function as a global (as the plugin does)
-        self.env.globals["kicad_schematic"] = kicad_schematic
+        cls.env.globals["kicad_schematic"] = kicad_schematic
+
+        # Template rendered by several tests, compiled once
+        cls.basic_template = cls.env.from_string('{{ kicad_schematic("test.kicad_sch") }}')
 
     def test_function_available_in_template(self):
         """Test that kicad_schematic is accessible in Jinja2 templates."""
@@ -32,8 +35,7 @@ class TestJinja2Integration(unittest.TestCase):
 
     def test_basic_call_in_template(self):
         """Test basic function call from Jinja2 template."""
-        template = self.env.from_string('{{ kicad_schematic("test.kicad_sch") }}')
-        result = template.render()
+        result = self.basic_template.render()
 
         self.assertIn("<kicanvas-embed", result)
         self.assertIn('src="test.kicad_sch"', result)
@@ -118,8 +120,7 @@ class TestJinja2Integration(unittest.TestCase):
 
     def test_html_escaping(self):
         """Test that HTML in output is not escaped by Jinja2."""
-        template = self.env.from_string('{{ kicad_schematic("test.kicad_sch") }}')
-        result = template.render()
+        result = self.basic_template.render()
 
         # Should contain actual HTML tags, not escaped
         self.assertIn("<kicanvas-embed", result)
@@ -129,10 +130,14 @@ class TestJinja2Integration(unittest.TestCase):
 class TestPelicanJinja2ContentSimulation(unittest.TestCase):
     """Simulate how pelican-jinja2content would use the function."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Create the Jinja2 environment (as pelican-jinja2content does) once."""
+        cls.env = Environment()
+        cls.env.globals["kicad_schematic"] = kicad_schematic
+
     def test_simulated_article_processing(self):
         """Simulate processing an article with pelican-jinja2content."""
-        from pelican_kicad_embed import kicad_schematic
-
         # Simulate article content
         article_content = """
         # My Electronics Project
@@ -144,12 +149,8 @@ class TestPelicanJinja2ContentSimulation(unittest.TestCase):
         {{ kicad_schematic("power_supply.kicad_sch") }}
         """
 
-        # Create Jinja2 environment (as pelican-jinja2content does)
-        env = Environment()
-        env.globals["kicad_schematic"] = kicad_schematic
-
         # Render the template
-        template = env.from_string(article_content)
+        template = self.env.from_string(article_content)
         rendered = template.render()
 
         # Verify both schematics are rendered
@@ -161,8 +162,6 @@ class TestPelicanJinja2ContentSimulation(unittest.TestCase):
 
     def test_with_pelican_like_metadata(self):
         """Test with metadata variables like Pelican would provide."""
-        from pelican_kicad_embed import kicad_schematic
-
         article_content = """
         Title: {{ title }}
         Date: {{ date }}
@@ -170,10 +169,7 @@ class TestPelicanJinja2ContentSimulation(unittest.TestCase):
         {{ kicad_schematic(schematic_path) }}
         """
 
-        env = Environment()
-        env.globals["kicad_schematic"] = kicad_schematic
-
-        template = env.from_string(article_content)
+        template = self.env.from_string(article_content)
         rendered = template.render(
             title="My Project", date="2025-11-17", schematic_path="project.kicad_sch"
         )
@@ -188,13 +184,10 @@ class TestPluginRegistration(unittest.TestCase):
 
     def test_add_jinja2_globals_function(self):
         """Test the add_jinja2_globals function."""
-        from pelican_kicad_embed import add_jinja2_globals, kicad_schematic
+        from pelican_kicad_embed import add_jinja2_globals
 
-        # Create a mock Pelican object
-        mock_pelican = Mock()
-        mock_pelican.env = Mock()
-        mock_pelican.env.globals = {}
-        mock_pelican.settings = {}
+        # Create a fake Pelican object
+        mock_pelican = FakePelican(env=SimpleNamespace(globals={}))
 
         # Call the registration function
         add_jinja2_globals(mock_pelican)
@@ -210,10 +203,8 @@ class TestPluginRegistration(unittest.TestCase):
         """Test add_jinja2_globals handles None env gracefully."""
         from pelican_kicad_embed import add_jinja2_globals
 
-        # Create a mock Pelican object with None env
-        mock_pelican = Mock()
-        mock_pelican.env = None
-        mock_pelican.settings = {}
+        # Create a fake Pelican object with None env
+        mock_pelican = FakePelican(env=None)
 
         # Should not raise an exception
         add_jinja2_globals(mock_pelican)
@@ -226,8 +217,8 @@ class TestPluginRegistration(unittest.TestCase):
         """Test add_jinja2_globals handles missing env attribute gracefully."""
         from pelican_kicad_embed import add_jinja2_globals
 
-        # Create a mock Pelican object without env attribute
-        mock_pelican = Mock(spec=[])
+        # Create an object without env (or settings) attribute
+        mock_pelican = object()
 
         # Should not raise an exception
         add_jinja2_globals(mock_pelican)
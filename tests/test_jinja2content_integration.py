@@ -6,12 +6,10 @@ function is available when templates are processed.
 
 from __future__ import annotations
 
-from typing import Any
-from unittest.mock import Mock
-
 from jinja2 import Environment
 
 from pelican_kicad_embed import add_jinja2_globals, kicad_schematic
+from tests.helpers import FakePelican
 
 
 class TestJinja2ContentIntegration:
@@ -20,9 +18,7 @@ class TestJinja2ContentIntegration:
     def test_add_jinja2_globals_registers_function(self) -> None:
         """Test that add_jinja2_globals adds kicad_schematic to env.globals and settings."""
         env = Environment()
-        mock_pelican = Mock()
-        mock_pelican.env = env
-        mock_pelican.settings = {}
+        mock_pelican = FakePelican(env=env)
 
         # Call our registration function
         add_jinja2_globals(mock_pelican)
@@ -54,9 +50,7 @@ class TestJinja2ContentIntegration:
         from pelican import signals
 
         env = Environment()
-        mock_pelican = Mock()
-        mock_pelican.env = env
-        mock_pelican.settings = {}
+        mock_pelican = FakePelican(env=env)
 
         # Connect our function to initialized signal
         signals.initialized.connect(add_jinja2_globals)
@@ -73,87 +67,45 @@ class TestJinja2ContentIntegration:
             # Cleanup
             signals.initialized.disconnect(add_jinja2_globals)
 
-    def test_signal_connection_with_get_generators(self) -> None:
-        """Test that function is registered when get_generators signal fires."""
-        from pelican import signals
-
+    def test_repeated_registration_is_idempotent(self) -> None:
+        """Test that registering twice leaves a single, unchanged entry."""
         env = Environment()
-        mock_pelican = Mock()
-        mock_pelican.env = env
-        mock_pelican.settings = {}
-
-        # Connect our function to get_generators signal (same as register() does)
-        def handler(sender: Any) -> None:
-            add_jinja2_globals(sender)
-
-        signals.get_generators.connect(handler)
-
-        try:
-            # Fire signal - sender is the first argument
-            signals.get_generators.send(mock_pelican)
-
-            # Check function was registered
-            assert "kicad_schematic" in env.globals
-            assert "kicad_schematic" in mock_pelican.settings["JINJA_GLOBALS"]
-        finally:
-            signals.get_generators.disconnect(handler)
+        mock_pelican = FakePelican(env=env)
 
-    def test_both_signals_register_function(self) -> None:
-        """Test that function works with both initialized and get_generators."""
-        from pelican import signals
+        add_jinja2_globals(mock_pelican)
+        add_jinja2_globals(mock_pelican)
 
-        env = Environment()
-        mock_pelican = Mock()
-        mock_pelican.env = env
-        mock_pelican.settings = {}
+        assert env.globals["kicad_schematic"] is kicad_schematic
+        assert mock_pelican.settings["JINJA_GLOBALS"] == {"kicad_schematic": kicad_schematic}
 
-        # Connect to both signals (like register() does)
-        signals.initialized.connect(add_jinja2_globals)
-        handler = lambda p: add_jinja2_globals(p)  # noqa: E731
-        signals.get_generators.connect(handler)
+    def test_readers_init_populates_settings_without_env(self) -> None:
+        """Test that settings are populated at readers_init time, before env exists.
 
-        try:
-            # Fire initialized first
-            signals.initialized.send(mock_pelican)
-            assert "kicad_schematic" in env.globals
-            assert "kicad_schematic" in mock_pelican.settings["JINJA_GLOBALS"]
+        This is CRITICAL for pelican-jinja2content compatibility.
+        The jinja2content plugin creates its own Environment in __init__ and reads
+        from settings["JINJA_GLOBALS"]. We must populate this BEFORE readers are created.
+        """
+        # NOTE: env may not exist yet at readers_init time
+        mock_pelican = FakePelican(env=None)
 
-            # Reset to test get_generators independently
-            del env.globals["kicad_schematic"]
-            del mock_pelican.settings["JINJA_GLOBALS"]["kicad_schematic"]
+        add_jinja2_globals(mock_pelican)
 
-            # Fire get_generators
-            signals.get_generators.send(mock_pelican)
-            assert "kicad_schematic" in env.globals
-            assert "kicad_schematic" in mock_pelican.settings["JINJA_GLOBALS"]
-        finally:
-            signals.initialized.disconnect(add_jinja2_globals)
-            # Can't disconnect lambda easily
+        # Check that settings were populated (even if env doesn't exist yet)
+        assert "JINJA_GLOBALS" in mock_pelican.settings
+        assert "kicad_schematic" in mock_pelican.settings["JINJA_GLOBALS"]
+        assert mock_pelican.settings["JINJA_GLOBALS"]["kicad_schematic"] == kicad_schematic
 
-    def test_readers_init_signal_for_jinja2content(self) -> None:
-        """Test that readers_init signal is used to populate settings before jinja2content init.
+    def test_register_wires_all_signals(self) -> None:
+        """Test that register() connects add_jinja2_globals to the expected signals.
 
-        This is CRITICAL for pelican-jinja2content compatibility.
-        The jinja2content plugin creates its own Environment in __init__ and reads
-        from settings["JINJA_GLOBALS"]. We must populate this BEFORE readers are created.
+        readers_init runs before pelican-jinja2content builds its Environment;
+        initialized covers the main Pelican environment.
         """
         from pelican import signals
 
-        mock_pelican = Mock()
-        mock_pelican.settings = {}
-        # NOTE: env may not exist yet at readers_init time
-        mock_pelican.env = None
-
-        # Connect to readers_init (fires BEFORE readers are created)
-        signals.readers_init.connect(add_jinja2_globals)
+        from pelican_kicad_embed import register
 
-        try:
-            # Fire readers_init signal
-            signals.readers_init.send(mock_pelican)
+        register()
 
-            # Check that settings were populated (even if env doesn't exist yet)
-            assert "JINJA_GLOBALS" in mock_pelican.settings
-            assert "kicad_schematic" in mock_pelican.settings["JINJA_GLOBALS"]
-            assert mock_pelican.settings["JINJA_GLOBALS"]["kicad_schematic"] == kicad_schematic
-        finally:
-            signals.readers_init.disconnect(add_jinja2_globals)
+        for signal in (signals.readers_init, signals.initialized):
+            assert add_jinja2_globals in list(signal.receivers_for(object()))
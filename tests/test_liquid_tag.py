@@ -1,54 +1,59 @@
 """Tests for the Liquid Tag handler."""
 
+import importlib
 import sys
+import types
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import patch
 
+# Tag handlers registered through the stubbed LiquidTags.register, by tag name
+registered_tags = {}
 
-class TestLiquidTag(unittest.TestCase):
-    """Test cases for Liquid Tag syntax parsing."""
 
-    @classmethod
-    def setUpClass(cls):
-        """Mock liquid_tags module before importing liquid_tag."""
-        # Create mock modules
-        mock_liquid_tags = MagicMock()
-        mock_mdx = MagicMock()
-        mock_liquid_tags_class = MagicMock()
-        mock_mdx.LiquidTags = mock_liquid_tags_class
+class _LiquidTagsStub:
+    """Stand-in for liquid_tags.mdx_liquid_tags.LiquidTags."""
+
+    @staticmethod
+    def register(tag_name):
+        """Record the decorated handler in registered_tags."""
+
+        def decorator(func):
+            registered_tags[tag_name] = func
+            return func
+
+        return decorator
 
-        # Setup register decorator mock
-        cls.registered_tags = {}
 
-        def register_decorator(tag_name):
-            def decorator(func):
-                cls.registered_tags[tag_name] = func
-                return func
+_mdx_liquid_tags = types.ModuleType("liquid_tags.mdx_liquid_tags")
+_mdx_liquid_tags.LiquidTags = _LiquidTagsStub
+_liquid_tags = types.ModuleType("liquid_tags")
+_liquid_tags.mdx_liquid_tags = _mdx_liquid_tags
 
-            return decorator
+_modules_patch = patch.dict(
+    sys.modules,
+    {"liquid_tags": _liquid_tags, "liquid_tags.mdx_liquid_tags": _mdx_liquid_tags},
+)
 
-        mock_liquid_tags_class.register = register_decorator
 
-        sys.modules["liquid_tags"] = mock_liquid_tags
-        sys.modules["liquid_tags.mdx_liquid_tags"] = mock_mdx
+def setUpModule():
+    """Stub liquid_tags and import liquid_tag once for the whole module."""
+    _modules_patch.start()
+    # Force a fresh import so the handler registers with the stub
+    sys.modules.pop("pelican_kicad_embed.liquid_tag", None)
+    importlib.import_module("pelican_kicad_embed.liquid_tag")
 
-        # Now import the module
-        from pelican_kicad_embed import liquid_tag
 
-        cls.liquid_tag_module = liquid_tag
+def tearDownModule():
+    """Restore sys.modules as it was before the stubs were installed."""
+    _modules_patch.stop()
+
+
+class TestLiquidTag(unittest.TestCase):
+    """Test cases for Liquid Tag syntax parsing."""
 
     def setUp(self):
         """Set up per-test fixtures."""
-        # Get the registered function as an instance variable
-        self.kicad_schematic_tag = self.__class__.registered_tags.get("kicad_schematic")
-
-    @classmethod
-    def tearDownClass(cls):
-        """Clean up mocks."""
-        if "liquid_tags" in sys.modules:
-            del sys.modules["liquid_tags"]
-        if "liquid_tags.mdx_liquid_tags" in sys.modules:
-            del sys.modules["liquid_tags.mdx_liquid_tags"]
+        self.kicad_schematic_tag = registered_tags["kicad_schematic"]
 
     def test_basic_syntax(self):
         """Test basic kicad_schematic Liquid Tag without options."""
@@ -138,6 +143,23 @@ class TestLiquidTag(unittest.TestCase):
         # Should still process the filename
         self.assertIn('src="/static/schematics/file.kicad_sch', result)
 
+    def test_other_quote_inside_value(self):
+        """Test that a value may contain the other kind of quote."""
+        markup = "file.kicad_sch style=\"font-family: 'Arial';\""
+        result = self.kicad_schematic_tag(None, "kicad_schematic", markup)
+
+        self.assertIn("style=\"font-family: 'Arial';\"", result)
+
+    def test_double_quote_inside_single_quoted_value(self):
+        """Test that a double quote cannot end the style attribute early."""
+        markup = "file.kicad_sch style='font-family: \"Fira Code\"; height: 400px;'"
+        result = self.kicad_schematic_tag(None, "kicad_schematic", markup)
+
+        # The option is rejected rather than copied into style="..."
+        self.assertEqual(
+            result, '<kicanvas-embed src="/static/schematics/file.kicad_sch"></kicanvas-embed>'
+        )
+
     def test_case_insensitive(self):
         """Test that parameter names are case-insensitive."""
         markup = 'file.kicad_sch STYLE="width: 100%;" CONTROLS="full"'
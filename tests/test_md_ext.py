@@ -8,9 +8,10 @@ from pelican_kicad_embed.md_ext import KiCadSchematicPreprocessor
 class TestMarkdownExtension(unittest.TestCase):
     """Test cases for Markdown extension parsing."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.preprocessor = KiCadSchematicPreprocessor(None)
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by all tests (the preprocessor is stateless)."""
+        cls.preprocessor = KiCadSchematicPreprocessor(None)
 
     def test_basic_syntax(self):
         """Test basic kicad_schematic syntax without options."""
@@ -61,6 +62,24 @@ class TestMarkdownExtension(unittest.TestCase):
         self.assertIn("<kicanvas-embed", result[1])
         self.assertEqual(result[2], "Some text after")
 
+    def test_does_not_match_across_lines(self):
+        """Test that a call split over several lines is left untouched."""
+        lines = ["{{ kicad_schematic(", '"amp.kicad_sch") }}']
+        result = self.preprocessor.run(lines)
+        self.assertEqual(result, lines)
+
+    def test_run_text_matches_run(self):
+        """Test that run_text on a whole document agrees with run on its lines."""
+        text = 'Intro\n{{ kicad_schematic("amp.kicad_sch", controls="full") }}\nOutro'
+        result = self.preprocessor.run_text(text)
+        self.assertEqual(result, "\n".join(self.preprocessor.run(text.split("\n"))))
+        self.assertIn('controls="full"', result)
+
+    def test_run_text_without_embed_returns_input(self):
+        """Test that run_text returns documents without embeds unchanged."""
+        text = "Plain text\nwith no embeds"
+        self.assertIs(self.preprocessor.run_text(text), text)
+
 
 if __name__ == "__main__":
     unittest.main()
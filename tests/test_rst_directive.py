@@ -1,77 +1,114 @@
 """Tests for the reStructuredText directive."""
 
 import unittest
+from unittest.mock import Mock
 
-from docutils.core import publish_parts
+from docutils import nodes
 
-from pelican_kicad_embed.rst_directive import register_directive
+from pelican_kicad_embed.rst_directive import KiCadSchematicDirective, register_directive
+from tests.helpers import embed_attrs, parse_rst
 
+register_directive()
 
-class TestRstDirective(unittest.TestCase):
-    """Test cases for reStructuredText directive parsing."""
+# Multi-line reST fixtures
+_RST_ALL_OPTIONS = """.. kicad-schematic:: test.kicad_sch
+   :style: width: 100%; height: 600px;
+   :controls: minimal"""
 
-    @classmethod
-    def setUpClass(cls):
-        """Register the directive before running tests."""
-        register_directive()
+_RST_MULTIPLE = """.. kicad-schematic:: a.kicad_sch
 
-    def _parse_rst(self, rst_text):
-        """Helper to parse reStructuredText and return HTML body."""
-        parts = publish_parts(rst_text, writer_name="html")
-        return parts["body"]
+.. kicad-schematic:: b.kicad_sch"""
 
-    def test_basic_syntax(self):
-        """Test basic kicad-schematic directive without options."""
-        rst = ".. kicad-schematic:: amplifier.kicad_sch"
-        html = self._parse_rst(rst)
-        self.assertIn('src="/static/schematics/amplifier.kicad_sch"', html)
-        self.assertIn("<kicanvas-embed", html)
+_RST_EMBEDDED = """Test Document
+=============
+
+Some text before.
+
+.. kicad-schematic:: amp.kicad_sch
+
+Some text after."""
+
+
+def _run_directive(filename, **options):
+    """Run the directive on its own, without the reST parser or writer."""
+    directive = KiCadSchematicDirective(
+        name="kicad-schematic",
+        arguments=[filename],
+        options=options,
+        content=[],
+        lineno=1,
+        content_offset=0,
+        block_text="",
+        state=Mock(),
+        state_machine=Mock(),
+    )
+    return directive.run()
+
+
+class TestKiCadSchematicDirectiveRun(unittest.TestCase):
+    """Test cases for KiCadSchematicDirective.run() called directly."""
+
+    def test_returns_single_raw_html_node(self):
+        """Test that run() returns one raw node in HTML format."""
+        result = _run_directive("amplifier.kicad_sch")
+        self.assertEqual(len(result), 1)
+        self.assertIsInstance(result[0], nodes.raw)
+        self.assertEqual(result[0]["format"], "html")
+        self.assertEqual(
+            embed_attrs(result[0].astext()), [{"src": "/static/schematics/amplifier.kicad_sch"}]
+        )
 
     def test_with_style_option(self):
         """Test directive with style option."""
-        rst = """.. kicad-schematic:: amp.kicad_sch
-   :style: width: 800px; height: 500px;"""
-        html = self._parse_rst(rst)
-        self.assertIn('style="width: 800px; height: 500px;"', html)
+        html = _run_directive("amp.kicad_sch", style="width: 800px; height: 500px;")[0].astext()
+        self.assertEqual(embed_attrs(html)[0]["style"], "width: 800px; height: 500px;")
 
     def test_with_controls_option(self):
         """Test directive with controls option."""
-        rst = """.. kicad-schematic:: amp.kicad_sch
-   :controls: full"""
-        html = self._parse_rst(rst)
-        self.assertIn('controls="full"', html)
+        html = _run_directive("amp.kicad_sch", controls="full")[0].astext()
+        self.assertEqual(embed_attrs(html)[0]["controls"], "full")
+
+    def test_without_options_omits_attributes(self):
+        """Test that missing options produce no style or controls attribute."""
+        html = _run_directive("amp.kicad_sch")[0].astext()
+        self.assertEqual(embed_attrs(html), [{"src": "/static/schematics/amp.kicad_sch"}])
+
+
+class TestRstDirective(unittest.TestCase):
+    """Test cases for reStructuredText directive parsing."""
+
+    def test_basic_syntax(self):
+        """Test basic kicad-schematic directive without options."""
+        rst = ".. kicad-schematic:: amplifier.kicad_sch"
+        html = parse_rst(rst)
+        self.assertEqual(embed_attrs(html), [{"src": "/static/schematics/amplifier.kicad_sch"}])
 
     def test_with_all_options(self):
         """Test directive with all options."""
-        rst = """.. kicad-schematic:: test.kicad_sch
-   :style: width: 100%; height: 600px;
-   :controls: minimal"""
-        html = self._parse_rst(rst)
-        self.assertIn('src="/static/schematics/test.kicad_sch"', html)
-        self.assertIn('style="width: 100%; height: 600px;"', html)
-        self.assertIn('controls="minimal"', html)
+        html = parse_rst(_RST_ALL_OPTIONS)
+        self.assertEqual(
+            embed_attrs(html),
+            [
+                {
+                    "src": "/static/schematics/test.kicad_sch",
+                    "controls": "minimal",
+                    "style": "width: 100%; height: 600px;",
+                }
+            ],
+        )
 
     def test_multiple_directives(self):
         """Test multiple directives in same document."""
-        rst = """.. kicad-schematic:: a.kicad_sch
-
-.. kicad-schematic:: b.kicad_sch"""
-        html = self._parse_rst(rst)
-        self.assertIn('src="/static/schematics/a.kicad_sch"', html)
-        self.assertIn('src="/static/schematics/b.kicad_sch"', html)
+        html = parse_rst(_RST_MULTIPLE)
+        sources = [attrs["src"] for attrs in embed_attrs(html)]
+        self.assertEqual(
+            sources, ["/static/schematics/a.kicad_sch", "/static/schematics/b.kicad_sch"]
+        )
 
     def test_embedded_in_document(self):
         """Test directive embedded in larger document."""
-        rst = """Test Document
-=============
-
-Some text before.
-
-.. kicad-schematic:: amp.kicad_sch
-
-Some text after."""
-        html = self._parse_rst(rst)
-        self.assertIn("<kicanvas-embed", html)
+        html = parse_rst(_RST_EMBEDDED)
+        self.assertEqual(len(embed_attrs(html)), 1)
         self.assertIn("Some text before", html)
         self.assertIn("Some text after", html)
 